@@ -0,0 +1,77 @@
+# 渲染配置（render profile）相关的辅助函数
+#
+# scrapy-playwright 的 PLAYWRIGHT_ABORT_REQUEST 是全局谓词，无法直接区分请求来自哪个配置。
+# 这里按页面记录需要拦截的资源类型和流量统计，由谓词查表决定是否中止请求。
+import weakref
+
+
+# 页面 -> 渲染状态（拦截的资源类型、流量统计），页面被回收后自动清理
+_page_states = weakref.WeakKeyDictionary()
+
+
+def resolve_render_profile(settings, name=None):
+    """
+    解析渲染配置，返回包含 name、headless、viewport、blocked_resource_types 的字典
+
+    name 为空时使用 RENDER_PROFILE 设置，并应用 RENDER_BLOCKED_RESOURCES 覆盖；
+    指定 name 时原样返回该配置（用于调试截图页切回 full 渲染）
+    """
+    profiles = settings.getdict('RENDER_PROFILES')
+    configured = name is None
+    if configured:
+        name = settings.get('RENDER_PROFILE', 'full')
+    if name not in profiles:
+        raise ValueError(f"未知的渲染配置: {name}，可选: {', '.join(profiles)}")
+
+    profile = dict(profiles[name], name=name)
+    if configured and settings.get('RENDER_BLOCKED_RESOURCES') is not None:
+        profile['blocked_resource_types'] = [
+            t.strip() for t in settings.getlist('RENDER_BLOCKED_RESOURCES') if t.strip()
+        ]
+    return profile
+
+
+def new_render_stats():
+    """创建单个页面的渲染统计"""
+    return {
+        'bytes': 0,
+        'requests': 0,
+        'aborted_requests': 0,
+    }
+
+
+def register_page(page, blocked_resource_types, stats):
+    """
+    登记页面的渲染状态
+
+    blocked_resource_types 为空时只统计流量，不拦截任何请求
+    """
+    _page_states[page] = (frozenset(blocked_resource_types), stats)
+
+    async def on_request_finished(request):
+        try:
+            sizes = await request.sizes()
+        except Exception:
+            # 页面关闭后无法再读取请求大小
+            return
+        stats['requests'] += 1
+        stats['bytes'] += sizes.get('responseHeadersSize', 0) + max(sizes.get('responseBodySize', 0), 0)
+
+    page.on("requestfinished", on_request_finished)
+
+
+def should_abort_request(request):
+    """PLAYWRIGHT_ABORT_REQUEST 谓词：中止当前页面配置中屏蔽的资源类型"""
+    try:
+        state = _page_states.get(request.frame.page)
+    except Exception:
+        # Service Worker 等请求没有关联的 frame
+        return False
+    if state is None:
+        return False
+
+    blocked_resource_types, stats = state
+    if request.resource_type in blocked_resource_types:
+        stats['aborted_requests'] += 1
+        return True
+    return False
@@ -15,10 +15,38 @@ DOWNLOAD_HANDLERS = {
     "https": "scrapy_playwright.handler.ScrapyPlaywrightDownloadHandler",
 }
 
+# 渲染配置（render profile）
+# full: 有头模式、1920x1080、加载全部资源（便于观察和手动完成验证码）
+# lite: 无头模式、较小视口、拦截提取时用不到的资源（图片、字体、媒体），适合容器内运行
+RENDER_PROFILES = {
+    "full": {
+        "headless": False,
+        "viewport": {"width": 1920, "height": 1080},
+        "blocked_resource_types": [],
+    },
+    "lite": {
+        "headless": True,
+        "viewport": {"width": 1280, "height": 720},
+        "blocked_resource_types": ["image", "font", "media"],
+    },
+}
+# 当前使用的渲染配置，也可用 scrapy crawl -s RENDER_PROFILE=lite 覆盖
+# 配置的校验以及有头/无头模式、视口、拦截类型的推导统一在 spider_project/render.py 中完成
+RENDER_PROFILE = os.getenv('RENDER_PROFILE', 'full')
+
+# 覆盖当前渲染配置拦截的资源类型（逗号分隔，如 image,font,media,stylesheet；不设置则使用配置中的默认值）
+RENDER_BLOCKED_RESOURCES = os.getenv('RENDER_BLOCKED_RESOURCES')
+
+# 是否保存第一页的调试截图和HTML（请求截图时该页自动切回 full 渲染）
+DEBUG_SCREENSHOT = os.getenv('DEBUG_SCREENSHOT', 'true').lower() in ('1', 'true', 'yes')
+
+# 按页面配置中止请求（见 spider_project/render.py）
+PLAYWRIGHT_ABORT_REQUEST = "spider_project.render.should_abort_request"
+
 # Playwright settings
 PLAYWRIGHT_BROWSER_TYPE = "chromium"  # 可选: chromium, firefox, webkit
 PLAYWRIGHT_LAUNCH_OPTIONS = {
-    "headless": False,  # 有头模式，可以看到浏览器窗口
+    # headless 由渲染配置决定，爬虫启动时写入（见 GoogleSearchSpider.update_settings）
     "timeout": 30000,
     # 增强反检测参数
     "args": [
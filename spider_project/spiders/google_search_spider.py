@@ -1,6 +1,7 @@
 import scrapy
 from scrapy_playwright.page import PageMethod
 from spider_project.items import GoogleSearchItem
+from spider_project.render import new_render_stats, register_page, resolve_render_profile
 from urllib.parse import quote_plus, urlparse, parse_qs, urlencode, urlunparse
 import os
 from datetime import datetime
@@ -22,6 +23,22 @@ class GoogleSearchSpider(scrapy.Spider):
     search_query = os.getenv('SEARCH_QUERY', 'python scrapy')
     max_pages = int(os.getenv('MAX_PAGES', '3'))  # 最多爬取页数
     
+    @classmethod
+    def update_settings(cls, settings):
+        """根据渲染配置设置有头/无头模式（在此统一校验 RENDER_PROFILE，包括 -s 传入的值）"""
+        super().update_settings(settings)
+        profile = resolve_render_profile(settings)
+        launch_options = settings.getdict('PLAYWRIGHT_LAUNCH_OPTIONS')
+        launch_options['headless'] = profile['headless']
+        settings.set('PLAYWRIGHT_LAUNCH_OPTIONS', launch_options, priority='spider')
+    
+    @classmethod
+    def from_crawler(cls, crawler, *args, **kwargs):
+        spider = super().from_crawler(crawler, *args, **kwargs)
+        spider.render_profile = resolve_render_profile(crawler.settings)
+        spider.full_render_profile = resolve_render_profile(crawler.settings, 'full')
+        return spider
+    
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         base_path = Path(__file__).parent.parent
@@ -111,21 +128,81 @@ class GoogleSearchSpider(scrapy.Spider):
         yield scrapy.Request(
             url=search_url,
             callback=self.parse,
-            meta={
-                "playwright": True,
-                "playwright_include_page": True,
-                "playwright_page_methods": [
-                    # 等待页面完全加载
-                    PageMethod("wait_for_load_state", "networkidle", timeout=60000),
-                ],
-            },
+            meta=self._playwright_meta(page_number=1),
             dont_filter=True
         )
     
+    def _render_profile_for(self, page_number):
+        """选择页面的渲染配置：需要保存调试截图的页面总是使用 full 渲染"""
+        if page_number == 1 and self.settings.getbool('DEBUG_SCREENSHOT', True):
+            return self.full_render_profile
+        return self.render_profile
+    
+    def _playwright_meta(self, page_number):
+        """构建 Playwright 请求的 meta（所有页面共用同一个浏览器上下文，保留 Cookie 会话）"""
+        profile = self._render_profile_for(page_number)
+        return {
+            "playwright": True,
+            "playwright_include_page": True,
+            "playwright_page_init_callback": self._init_page,
+            "playwright_page_methods": [
+                # 等待页面完全加载
+                PageMethod("wait_for_load_state", "networkidle", timeout=60000),
+            ],
+            "page_number": page_number,
+            "render_profile": profile['name'],
+        }
+    
+    async def _init_page(self, page, request):
+        """新页面创建后按渲染配置设置视口、登记资源拦截和流量统计"""
+        profile = self._render_profile_for(request.meta["page_number"])
+        await page.set_viewport_size(profile['viewport'])
+        request.meta["render_stats"] = new_render_stats()
+        register_page(page, profile['blocked_resource_types'], request.meta["render_stats"])
+    
+    def _record_render_stats(self, response):
+        """
+        将页面的传输字节数和渲染耗时写入 stats，便于对比不同渲染配置
+        
+        在 parse 开头调用，字节数与 download_latency 覆盖同一时间段（打开页面到 networkidle），
+        不包含之后的模拟滚动、验证码等待和翻页前等待
+        """
+        profile = response.meta.get("render_profile")
+        render_stats = response.meta.get("render_stats")
+        if not profile or render_stats is None:
+            return
+        
+        render_time = response.meta.get("download_latency", 0.0)
+        stats = self.crawler.stats
+        prefix = f"render/{profile}"
+        stats.inc_value(f"{prefix}/pages")
+        stats.inc_value(f"{prefix}/bytes", render_stats['bytes'])
+        stats.inc_value(f"{prefix}/requests", render_stats['requests'])
+        stats.inc_value(f"{prefix}/aborted_requests", render_stats['aborted_requests'])
+        stats.inc_value(f"{prefix}/render_time", render_time, start=0.0)
+        self.logger.info(
+            f"渲染统计 [{profile}]: 传输 {render_stats['bytes'] / 1024:.1f} KB，"
+            f"{render_stats['requests']} 个请求，拦截 {render_stats['aborted_requests']} 个，"
+            f"渲染耗时 {render_time:.2f} 秒"
+        )
+    
+    def closed(self, reason):
+        """爬虫结束时计算各渲染配置的每页平均值"""
+        stats = self.crawler.stats
+        for profile in self.settings.getdict('RENDER_PROFILES'):
+            pages = stats.get_value(f"render/{profile}/pages")
+            if not pages:
+                continue
+            stats.set_value(f"render/{profile}/avg_bytes_per_page",
+                            stats.get_value(f"render/{profile}/bytes", 0) // pages)
+            stats.set_value(f"render/{profile}/avg_render_time",
+                            round(stats.get_value(f"render/{profile}/render_time", 0.0) / pages, 3))
+    
     async def parse(self, response):
         """解析搜索结果页面"""
         page = response.meta.get("playwright_page")
         page_number = response.meta.get("page_number", 1)
+        self._record_render_stats(response)
         
         try:
             # 在页面加载前注入反检测脚本
@@ -179,8 +256,8 @@ class GoogleSearchSpider(scrapy.Spider):
                         self.logger.error("页面已被关闭，无法继续")
                         return
             
-            # 保存页面内容以便调试（总是保存第一页）
-            if page_number == 1:
+            # 保存页面内容以便调试（DEBUG_SCREENSHOT 开启时保存第一页）
+            if page_number == 1 and self.settings.getbool('DEBUG_SCREENSHOT', True):
                 try:
                     # 检查logs目录是否存在，不存在则创建
                     logs_dir = Path(__file__).parent.parent.parent / "logs"
@@ -380,14 +457,7 @@ class GoogleSearchSpider(scrapy.Spider):
                     yield scrapy.Request(
                         url=next_page_url,
                         callback=self.parse,
-                        meta={
-                            "playwright": True,
-                            "playwright_include_page": True,
-                            "playwright_page_methods": [
-                                PageMethod("wait_for_load_state", "networkidle", timeout=60000),
-                            ],
-                            "page_number": page_number + 1,
-                        },
+                        meta=self._playwright_meta(page_number=page_number + 1),
                         dont_filter=True
                     )
                 else: